@@ -0,0 +1,54 @@
+"""Cold-start latency of common cncparser entry points.
+
+Each statement is run in a fresh interpreter several times, reported time is
+the best run minus the best run of bare `python -c pass`.
+
+Usage:
+    $ python benchmarks/import_time.py [repeat]
+"""
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = [
+    ('baseline', 'pass'),
+    ('package', 'import cncparser'),
+    ('utils', 'from cncparser.utils import convert_timedelta'),
+    ('cache', 'from cncparser.cache import QueryCache'),
+    ('read_report', 'from cncparser import read_report'),
+    ('parser', 'import lxml.html'),
+]
+
+
+def cold_start(statement, repeat):
+    """Returns best wall time of running statement in a new interpreter"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.check_call([sys.executable, '-c', statement], cwd=ROOT)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(repeat=10):
+    baseline = None
+    print('{:<12} {:>10} {:>10}  {}'.format(
+        'entry', 'total ms', 'extra ms', 'lxml loaded'))
+    for name, statement in ENTRY_POINTS:
+        total = cold_start(statement, repeat)
+        if baseline is None:
+            baseline = total
+        loaded = subprocess.check_output(
+            [sys.executable, '-c',
+             statement + "\nimport sys; print('lxml' in sys.modules)"],
+            cwd=ROOT
+        ).decode().strip()
+        print('{:<12} {:>10.1f} {:>10.1f}  {}'.format(
+            name, total * 1000, (total - baseline) * 1000, loaded))
+
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:]])
@@ -0,0 +1,78 @@
+"""Parallel aggregation: pickled Report objects vs shared memory transport.
+
+Generates event-dense fake reports in a temporary folder, then aggregates
+them with both approaches using the same number of worker processes.
+
+Usage:
+    $ python benchmarks/shared_memory.py [reports] [events] [processes]
+"""
+import os
+import sys
+import time
+from datetime import date, timedelta
+from multiprocessing import Pool
+from tempfile import TemporaryDirectory
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cncparser.report import Report  # NOQA
+from cncparser.transport import read_folder_shared  # NOQA
+from cncparser.utils import aggregate_data  # NOQA
+
+ROW = '<tr><td>{}</td><td>{}</td><td>{}</td><td>-</td></tr>\n'
+
+
+def write_report(path, events):
+    """Write report with given number of rows spread over the day"""
+    step = 86400 // (events + 1)
+    rows = ['<html><table><tr><th>time</th><th>name</th><th>status</th>'
+            '<th>-</th></tr>\n']
+    for i in range(events):
+        name = 'Folder/Sub/prg{}ver1.ISO'.format(i // 2 % 50)
+        status = 'STOPPED' if i % 2 else 'STARTED'
+        rows.append(ROW.format(timedelta(seconds=step * (i + 1)), name,
+                               status))
+    rows.append('</table></html>')
+    with open(path, 'w') as f:
+        f.writelines(rows)
+
+
+def pickled(paths, processes):
+    with Pool(processes) as pool:
+        return aggregate_data(pool.map(Report, paths))
+
+
+def shared(folder, processes):
+    with read_folder_shared(folder, processes) as results:
+        return results.aggregate()
+
+
+def best_of(func, *args, repeat=3):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(reports=200, events=10000, processes=None):
+    with TemporaryDirectory() as folder:
+        paths = []
+        for i in range(reports):
+            day = date(2017, 1, 1) + timedelta(days=i)
+            name = day.strftime('%Y_%m_%d.html')
+            paths.append(os.path.join(folder, name))
+            write_report(paths[-1], events)
+        paths.sort()
+        pickled_time, expected = best_of(pickled, paths, processes)
+        shared_time, result = best_of(shared, folder, processes)
+        assert result == expected
+    print('{} reports x {} events'.format(reports, events))
+    print('pickled Report objects: {:8.3f} s'.format(pickled_time))
+    print('shared memory:          {:8.3f} s'.format(shared_time))
+
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:]])
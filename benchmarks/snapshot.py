@@ -0,0 +1,82 @@
+"""Reload time of a parsed corpus: snapshot file vs pickled Report objects.
+
+Builds a synthetic multi-year corpus in memory, saves it both ways and
+measures how long it takes to load it back and aggregate summaries.
+
+Usage:
+    $ python benchmarks/snapshot.py [days] [events]
+"""
+import os
+import pickle
+import sys
+import time
+from datetime import date, timedelta
+from tempfile import TemporaryDirectory
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cncparser.jobs import job_names  # NOQA
+from cncparser.report import Report  # NOQA
+from cncparser.snapshot import load_snapshot, save_snapshot  # NOQA
+from cncparser.utils import aggregate_data  # NOQA
+
+
+def make_report(day, events):
+    """Returns Report with synthetic rows, without parsing any file"""
+    report = Report.__new__(Report)
+    report.path = day.strftime('/reports/%Y_%m_%d.html')
+    report.job_names = job_names
+    step = 86400 // (events + 1)
+    report.data = [
+        (timedelta(seconds=step * (i + 1)),
+         'Folder/Sub/prg{}ver1.ISO'.format(i // 2 % 50),
+         'STOPPED' if i % 2 else 'STARTED')
+        for i in range(events)
+    ]
+    report.name_from_path()
+    report.date_from_name()
+    report.sum_data()
+    return report
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main(days=1095, events=200):
+    first = date(2015, 1, 1)
+    reports = [make_report(first + timedelta(days=i), events)
+               for i in range(days)]
+    expected = aggregate_data(reports)
+    with TemporaryDirectory() as folder:
+        snapshot_path = os.path.join(folder, 'corpus.snap')
+        pickle_path = os.path.join(folder, 'corpus.pickle')
+        save_time, _ = timed(save_snapshot, reports, snapshot_path)
+        with open(pickle_path, 'wb') as f:
+            pickle.dump(reports, f, pickle.HIGHEST_PROTOCOL)
+
+        def load_pickle():
+            with open(pickle_path, 'rb') as f:
+                return aggregate_data(pickle.load(f))
+
+        def load():
+            with load_snapshot(snapshot_path) as snapshot:
+                return aggregate_data(snapshot)
+
+        pickle_time, pickled = timed(load_pickle)
+        snapshot_time, loaded = timed(load)
+        assert pickled == loaded == expected
+        print('{} reports x {} events'.format(days, events))
+        print('snapshot size {:.1f} MB, pickle size {:.1f} MB'.format(
+            os.path.getsize(snapshot_path) / 2 ** 20,
+            os.path.getsize(pickle_path) / 2 ** 20))
+        print('save snapshot:               {:8.3f} s'.format(save_time))
+        print('load pickle + aggregate:     {:8.3f} s'.format(pickle_time))
+        print('load snapshot + aggregate:   {:8.3f} s'.format(snapshot_time))
+
+
+if __name__ == '__main__':
+    main(*[int(x) for x in sys.argv[1:]])
@@ -1 +1,34 @@
-from .report import read_report, read_folder  # NOQA
+import importlib
+
+# Submodules are imported on first access, so `import cncparser` stays cheap
+# for code that only needs cncparser.utils or a cached summary.
+_LAZY = {
+    'read_report': 'report',
+    'read_folder': 'report',
+    'read_folder_ordered': 'report',
+    'read_folders': 'report',
+}
+
+_SUBMODULES = ('cache', 'jobs', 'pipeline', 'report', 'snapshot',
+               'transport', 'utils')
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        # Importing a submodule sets it as an attribute of the package.
+        return importlib.import_module('.' + name, __name__)
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(
+            'module {!r} has no attribute {!r}'.format(__name__, name)
+        ) from None
+    value = getattr(importlib.import_module('.' + module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY) | set(_SUBMODULES))
@@ -0,0 +1,135 @@
+from collections import OrderedDict, defaultdict, namedtuple
+from datetime import timedelta
+
+from .utils import _as_date, _convert_date, aggregate_data, filter_by_date
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class QueryCache:
+    """Set of reports with memoised filter -> aggregate -> transform queries.
+
+    Results are kept in the LRU cache keyed on (version, min date, max date,
+    group, transform). Version of the set changes each time reports are
+    added, replaced or removed through this object, so stale results are
+    never returned for such changes.
+
+    Changes made to reports in place, e.g. to their summary dicts, are not
+    tracked: watching them would cost a pass over all reports on each
+    query. Call invalidate() after such changes, or add() the changed
+    report again.
+
+    Returned results are shared between calls and shouldn't be modified.
+
+    Parameters
+    ----------
+    reports : iterable
+        Report objects to start with.
+    maxsize : int or None
+        Maximal number of results kept in the cache, None means no limit.
+        Negative values are treated as 0, same as functools.lru_cache does.
+
+    Attributes
+    ----------
+    version : int
+        Version of the report set.
+    maxsize : int or None
+        Maximal number of results kept in the cache.
+    """
+
+    def __init__(self, reports=(), maxsize=128):
+        if maxsize is not None:
+            if not isinstance(maxsize, int):
+                raise TypeError(maxsize, 'is not an integer or None')
+            maxsize = max(maxsize, 0)
+        self.maxsize = maxsize
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._reports = {}
+        self._results = OrderedDict()
+        for report in reports:
+            self.add(report)
+
+    def __len__(self):
+        return len(self._reports)
+
+    def __iter__(self):
+        return iter(self._reports.values())
+
+    @property
+    def hit_rate(self):
+        """float : Share of queries answered from the cache"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def cache_info(self):
+        """Returns cache statistics, same as functools.lru_cache does"""
+        return CacheInfo(self.hits, self.misses, self.maxsize,
+                         len(self._results))
+
+    def add(self, report):
+        """Add report to the set, report with the same date is replaced"""
+        self._reports[_as_date(report.date)] = report
+        self.invalidate()
+
+    def remove(self, report):
+        """Remove report with the same date as given one from the set"""
+        del self._reports[_as_date(report.date)]
+        self.invalidate()
+
+    def invalidate(self):
+        """Drop cached results.
+
+        Called automatically by add() and remove(), should be called manually
+        if reports in the set were modified in place.
+        """
+        self.version += 1
+        self._results.clear()
+
+    def query(self, _min, _max, group=None, transform=None):
+        """Returns summarized data of reports in _min, _max date range.
+
+        Parameters
+        ----------
+        _min : str or datetime
+            minimal date limit to filter.
+        _max : str or datetime
+            maximal date limit to filter.
+        group : callable
+            Function applied to job names to group them, e.g.
+            simplify_job_name.
+        transform : callable
+            Function applied to summarized data, e.g. sort_descending.
+
+        Returns
+        -------
+        defaultdict
+            Summarized data, or whatever transform returned.
+        """
+        _min, _max = [_as_date(_convert_date(x)) for x in (_min, _max)]
+        key = (self.version, _min, _max, group, transform)
+        try:
+            result = self._results[key]
+        except KeyError:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._results.move_to_end(key)
+            return result
+        result = self._compute(_min, _max, group, transform)
+        self._results[key] = result
+        if self.maxsize is not None and len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+        return result
+
+    def _compute(self, _min, _max, group, transform):
+        """Run query without cache, see query()"""
+        data = aggregate_data(filter_by_date(self, _min, _max))
+        if group is not None:
+            grouped = defaultdict(timedelta)
+            for k, v in data.items():
+                grouped[k if k == 'idle' else group(k)] += v
+            data = grouped
+        return transform(data) if transform is not None else data
@@ -0,0 +1,163 @@
+import threading
+from collections import defaultdict
+from datetime import timedelta
+
+from .utils import simplify_job_name
+
+
+IDLE = 0  # id of the 'idle' summary key, reserved in every JobNames.
+
+
+class JobNames:
+    """Dictionary of job names shared between reports.
+
+    Each raw job name gets an integer id the first time it's seen.
+    Simplified name and folder components are computed once per id, so
+    per-job rollups can group by id and resolve strings only on output.
+
+    Id 0 is reserved for 'idle'.
+
+    Names are never removed, so the dictionary grows with the number of
+    distinct job names seen, which is small even for years of reports.
+    Use a separate JobNames for unrelated corpora. intern() is thread
+    safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = {}
+        self._names = []
+        self._simplified = []
+        self._folders = []
+        self.intern('idle')
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._ids
+
+    def __getitem__(self, job_id):
+        """Returns raw job name for given id"""
+        return self._names[job_id]
+
+    def intern(self, name):
+        """Returns id of the job name, assigning a new one if needed.
+
+        Parameters
+        ----------
+        name : str
+            Raw job name.
+
+        Returns
+        -------
+        int
+            Job's id.
+        """
+        job_id = self._ids.get(name)
+        if job_id is not None:
+            return job_id
+        with self._lock:
+            job_id = self._ids.get(name)
+            if job_id is None:
+                job_id = len(self._names)
+                self._names.append(name)
+                self._simplified.append(None)
+                self._folders.append(None)
+                # Published last, so other threads never see an id
+                # without a name.
+                self._ids[name] = job_id
+            return job_id
+
+    def canonical(self, name):
+        """Returns the single stored copy of the job name.
+
+        Used while parsing so that rows of all reports share one string
+        object per job instead of keeping their own copies.
+        """
+        return self._names[self.intern(name)]
+
+    def simplified(self, job_id):
+        """Returns simplify_job_name() of the job, computed once per id"""
+        name = self._simplified[job_id]
+        if name is None:
+            name = self._simplified[job_id] = simplify_job_name(
+                self._names[job_id])
+        return name
+
+    def folder(self, job_id):
+        """Returns tuple of folders the job is placed in, computed once"""
+        folder = self._folders[job_id]
+        if folder is None:
+            folder = self._folders[job_id] = tuple(
+                self._names[job_id].split('/')[:-1])
+        return folder
+
+    def resolve(self, data, by='name'):
+        """Returns data keyed by job ids converted to data keyed by strings.
+
+        Parameters
+        ----------
+        data : dict
+            Dictionary where keys are job ids and values are timedeltas.
+        by : str
+            'name' to use raw names, 'simplified' to use simplified names
+            or 'folder' to use folder tuples. Values of jobs that end up
+            under the same key are summarized. 'idle' is kept as it is.
+
+        Returns
+        -------
+        defaultdict
+            defaultdict with string keys.
+
+        Raises
+        ------
+        ValueError
+            Raised if by isn't one of the values listed above.
+        """
+        if by == 'name':
+            key = self.__getitem__
+        elif by == 'simplified':
+            key = self.simplified
+        elif by == 'folder':
+            key = self.folder
+        else:
+            raise ValueError(by, 'is not one of: name, simplified, folder')
+        resolved = defaultdict(timedelta)
+        for job_id, value in data.items():
+            resolved['idle' if job_id == IDLE else key(job_id)] += value
+        return resolved
+
+
+# Dictionary used by reports by default, shared by the whole process.
+job_names = JobNames()
+
+
+def aggregate_ids(sequence):
+    """Returns summarized data of all reports keyed by job ids.
+
+    Parameters
+    ----------
+    sequence : iterable
+        Sequence that contains report objects.
+
+    Returns
+    -------
+    defaultdict
+        defaultdict with summarized data, use JobNames.resolve() to get
+        job names back.
+    """
+    data = defaultdict(timedelta)
+    for item in sequence:
+        for k, v in item.summary_ids.items():
+            data[k] += v
+    return data
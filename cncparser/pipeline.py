@@ -0,0 +1,271 @@
+"""Lazy pipeline stages over report files.
+
+Stages are functions that take an iterable and return a new lazy one, so a
+whole pipeline is a single pass over discovered files and only one report
+is parsed and kept in memory at a time:
+
+    >>> run(scan('data/programs'),
+    ...     select_dates('2017-01-01', '2017-12-31'),
+    ...     project(fields=['date', 'idle']),
+    ...     group(lambda item: item['date'].month),
+    ...     reduce(lambda total, item: total + item['idle'], timedelta()))
+    {1: datetime.timedelta(...), 2: datetime.timedelta(...), ...}
+"""
+import os
+from copy import deepcopy
+from datetime import timedelta
+
+from .report import Report, date_from_filename
+from .utils import _as_date, _convert_date
+
+FIELDS = ('path', 'name', 'date', 'data', 'runs', 'summary', 'idle',
+          'busy_time', 'jobs')
+
+
+class Record:
+    """Report file flowing through a pipeline.
+
+    Path and date are known from the file name, the report is parsed only
+    when one of other fields is accessed.
+
+    Attributes
+    ----------
+    path : str
+        System path to a report file.
+    date : date
+        date obj, representing date report was generated.
+    """
+
+    __slots__ = ('path', 'date', '_report', '_summary')
+
+    def __init__(self, path):
+        self.path = path
+        self.date = date_from_filename(path)
+        self._report = None
+        self._summary = None
+
+    @property
+    def name(self):
+        """str : File name extracted from file path"""
+        return os.path.split(self.path)[1]
+
+    @property
+    def report(self):
+        """Report : Report parsed on first access"""
+        if self._report is None:
+            self._report = Report(self.path)
+        return self._report
+
+    @property
+    def data(self):
+        """list : Raw rows of the report"""
+        return self.report.data
+
+    @property
+    def runs(self):
+        """list : Job runs of the report"""
+        return self.report.runs
+
+    @property
+    def summary(self):
+        """dict : Summary of the report, possibly changed by map_summary()"""
+        if self._summary is None:
+            return self.report.summary
+        return self._summary
+
+    @summary.setter
+    def summary(self, value):
+        self._summary = value
+
+    @property
+    def idle(self):
+        """timedelta : Time laser was in idle"""
+        return self.summary.get('idle')
+
+    @property
+    def busy_time(self):
+        """timedelta : Time laser was in work"""
+        values = [v for k, v in self.summary.items() if k != 'idle']
+        return sum(values, timedelta())
+
+    @property
+    def jobs(self):
+        """dict : Time each job was in work"""
+        return {k: v for k, v in self.summary.items() if k != 'idle'}
+
+    def release(self):
+        """Drop parsed report, keeping only a changed summary if any"""
+        self._report = None
+
+
+class Grouped:
+    """Iterable of (key, item) pairs produced by group()"""
+
+    def __init__(self, pairs):
+        self.pairs = pairs
+
+    def __iter__(self):
+        return iter(self.pairs)
+
+
+def scan(*paths):
+    """Returns Records for html files in given folders, in date order.
+
+    Only file names are read, nothing is parsed.
+
+    Parameters
+    ----------
+    *paths : str
+        Paths to the directories.
+
+    Returns
+    -------
+    generator object
+        Record objects.
+
+    Raises
+    ------
+    NotADirectoryError
+        Raised if any of given paths is not existing directory.
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            raise NotADirectoryError('{} is not a folder'.format(path))
+    files = sorted(
+        (os.path.join(path, file) for path in paths
+         for file in os.listdir(path) if file.endswith('.html')),
+        key=lambda x: (date_from_filename(x), x)
+    )
+    return (Record(file) for file in files)
+
+
+def run(source, *stages):
+    """Apply stages to source one after another.
+
+    Parameters
+    ----------
+    source : iterable
+        Records, usually returned by scan().
+    *stages : callable
+        Stages, each one takes result of the previous one.
+
+    Returns
+    -------
+    object
+        Result of the last stage.
+    """
+    result = source
+    for stage in stages:
+        result = stage(result)
+    return result
+
+
+def select_dates(_min, _max):
+    """Stage that keeps records in _min, _max date range.
+
+    Uses dates from file names, so skipped files are never parsed.
+
+    Parameters
+    ----------
+    _min : str, datetime or date
+        minimal date limit to filter.
+    _max : str, datetime or date
+        maximal date limit to filter.
+    """
+    _min, _max = [_as_date(_convert_date(x)) for x in (_min, _max)]
+
+    def stage(records):
+        return (x for x in records if _max >= x.date >= _min)
+    return stage
+
+
+def map_summary(func):
+    """Stage that replaces summary of each record with func(summary).
+
+    Parameters
+    ----------
+    func : callable
+        Function that takes summary dict and returns a new one.
+    """
+    def stage(records):
+        for record in records:
+            record.summary = func(record.summary)
+            yield record
+    return stage
+
+
+def project(fields):
+    """Stage that turns records into dicts with given fields only.
+
+    Parsed report is released right after the fields are taken, so unless
+    'data' or 'runs' is asked for, rows are discarded as soon as they are
+    summarized.
+
+    Parameters
+    ----------
+    fields : iterable
+        Names of fields, any of FIELDS.
+
+    Raises
+    ------
+    ValueError
+        Raised if some of fields is unknown.
+    """
+    fields = list(fields)
+    unknown = [x for x in fields if x not in FIELDS]
+    if unknown:
+        raise ValueError(unknown, 'are not in {}'.format(FIELDS))
+
+    def stage(records):
+        for record in records:
+            item = {field: getattr(record, field) for field in fields}
+            record.release()
+            yield item
+    return stage
+
+
+def group(key):
+    """Stage that tags each item with key(item) for reduce().
+
+    Parameters
+    ----------
+    key : callable
+        Function that returns group key for an item.
+    """
+    def stage(items):
+        return Grouped((key(item), item) for item in items)
+    return stage
+
+
+def reduce(func, initial=None):
+    """Final stage that folds items into a single value.
+
+    If previous stage is group(), items are folded per group and a dict of
+    group keys and values is returned. Only the accumulated values are
+    kept in memory.
+
+    Parameters
+    ----------
+    func : callable
+        Function that takes accumulated value and an item.
+    initial : object
+        Start value, copied for each group. If None, the first item is
+        used instead.
+    """
+    def fold(value, item, started):
+        if started:
+            return func(value, item)
+        return item if initial is None else func(deepcopy(initial), item)
+
+    def stage(items):
+        if isinstance(items, Grouped):
+            results = {}
+            for key, item in items:
+                results[key] = fold(results.get(key), item, key in results)
+            return results
+        value, started = initial, False
+        for item in items:
+            value = fold(value, item, started)
+            started = True
+        return value
+    return stage
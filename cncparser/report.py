@@ -1,9 +1,31 @@
+import hashlib
 import os
 
 from datetime import datetime, timedelta, date
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 
-import lxml.html
+from .jobs import job_names as default_job_names
+
+
+class Run(namedtuple('Run', ['name', 'start', 'end'])):
+    """Single continuous run of a job
+
+    Attributes
+    ----------
+    name : str
+        Job's name.
+    start : datetime
+        Moment the job was started.
+    end : datetime
+        Moment the job was stopped.
+    """
+
+    __slots__ = ()
+
+    @property
+    def duration(self):
+        """timedelta : Returns the time job was in work"""
+        return self.end - self.start
 
 
 class Report:
@@ -19,20 +41,51 @@ class Report:
         File name extracted from file path.
     date : datetime
         datetime obj, representing date report was generated.
+    runs : list
+        Run tuples for every job run found in the report, computed on
+        first access.
+    job_names : JobNames
+        Dictionary job names are interned in while parsing.
     """
 
-    def __init__(self, path):
+    def __init__(self, path, job_names=None):
         self.path = path
-        self.data = list(parse(self.path))
+        if job_names is None:
+            job_names = default_job_names
+        self.job_names = job_names
+        self.data = list(parse(self.path, job_names))
         self.name_from_path()
         self.date_from_name()
         self.sum_data()
 
+    def __getstate__(self):
+        # Shared job names dictionary isn't sent along with each report,
+        # ids of the other process mean nothing here, so they are dropped
+        # too. Custom dictionaries are pickled as they are.
+        state = self.__dict__.copy()
+        if state.get('job_names') is default_job_names:
+            del state['job_names']
+            state.pop('_summary_ids', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__.setdefault('job_names', default_job_names)
+
     @property
     def date_as_string(self):
         """str : String representation of datetime object"""
         return datetime.strftime(self.date, '%Y-%m-%d')
 
+    @property
+    def runs(self):
+        """list : Returns job runs, computed by split_runs() once"""
+        try:
+            return self._runs
+        except AttributeError:
+            self._runs = self.split_runs()
+            return self._runs
+
     @property
     def idle_time(self):
         """timedelta : Returns the time laser was in idle"""
@@ -49,6 +102,21 @@ class Report:
         """dict : Returns parsed programs"""
         return {k: v for k, v in self.summary.items() if k != 'idle'}
 
+    @property
+    def summary_ids(self):
+        """dict : Returns summary keyed by job ids from self.job_names
+
+        Computed once per report, so rollups over many reports don't hash
+        job names again.
+        """
+        try:
+            return self._summary_ids
+        except AttributeError:
+            names = self.job_names
+            self._summary_ids = {names.intern(k): v
+                                 for k, v in self.summary.items()}
+            return self._summary_ids
+
     def items(self):
         """Simple addapter to dict .items() method"""
         return self.summary.items()
@@ -59,8 +127,7 @@ class Report:
 
     def date_from_name(self):
         """Set self.date extracted from report's name"""
-        date_ints = [int(x) for x in os.path.splitext(self.name)[0].split('_')]
-        self.date = date(*date_ints)
+        self.date = date_from_filename(self.name)
 
     def sum_data(self):
         """Summarize parsed data
@@ -131,6 +198,118 @@ class Report:
                 idle += timedelta(days=1) - current
         data['idle'] += idle
         self.summary = data
+        self.__dict__.pop('_summary_ids', None)
+
+    def split_runs(self):
+        """Returns list of job runs found in parsed data
+
+        Works the same way as sum_data() does, but instead of summing time up
+        keeps the moments each job was started and stopped, so durations of
+        runs always sum up to the summary.
+
+        Each STOPPED row ends a run that began at the previous row, leading
+        STOPPED row means the job was started the day before, so its run
+        begins at the midnight. Trailing STARTED row means the job was
+        still in work at the end of the day, so its run ends at the next
+        midnight. Use stitch_runs() to join such runs with the next report.
+        """
+        midnight = datetime.combine(self.date, datetime.min.time())
+        runs = []
+        current = midnight  # Moment of the previous row.
+        status = None
+        for time, name, status in self.data:
+            moment = midnight + time
+            if status != 'STARTED':
+                runs.append(Run(name, current, moment))
+            current = moment
+        if status == 'STARTED':
+            runs.append(Run(name, current, midnight + timedelta(days=1)))
+        return runs
+
+    def shared_copy(self, path):
+        """Returns Report for a file with the same content, without parsing
+
+        Parsed rows and summary are shared with this report, name and date
+        are taken from the new path.
+
+        Parameters
+        ----------
+        path : str
+            Path to the file that has the same content as this report.
+
+        Returns
+        -------
+        Report
+            Report instance.
+        """
+        report = type(self).__new__(type(self))
+        report.path = path
+        report.job_names = self.job_names
+        report.data = self.data
+        report.name_from_path()
+        report.date_from_name()
+        report.summary = self.summary
+        if '_summary_ids' in self.__dict__:
+            report._summary_ids = self._summary_ids
+        return report
+
+
+def date_from_filename(name):
+    """Returns date extracted from report's file name.
+
+    Parameters
+    ----------
+    name : str
+        Report's file name or path, e.g. '2017_07_04.html'.
+
+    Returns
+    -------
+    date
+        date object the report was generated.
+    """
+    name = os.path.splitext(os.path.split(name)[1])[0]
+    return date(*[int(x) for x in name.split('_')])
+
+
+def stitch_runs(previous, report):
+    """Join job run that spans midnight into a single run.
+
+    If the last job of the previous report was still in work at the end of
+    the day and the first row of the next day's report stops the same job,
+    two halves are replaced with one run kept in previous.runs.
+
+    Summaries are not affected, each report still accounts only the time
+    of its own day.
+
+    Only reports of adjacent days are joined. A job that was in work for
+    the whole day in between, so that day has no report or no rows, is
+    left as two separate runs.
+
+    Parameters
+    ----------
+    previous : Report
+        Report of the earlier day.
+    report : Report
+        Report of the day right after previous.
+
+    Returns
+    -------
+    bool
+        True if runs were stitched, False otherwise.
+    """
+    if report.date - previous.date != timedelta(days=1):
+        return False
+    if not (previous.data and report.data and previous.runs and report.runs):
+        return False
+    _, last_name, last_status = previous.data[-1]
+    _, first_name, first_status = report.data[0]
+    if (last_status, first_status) != ('STARTED', 'STOPPED'):
+        return False
+    if last_name != first_name:
+        return False
+    head, tail = previous.runs[-1], report.runs.pop(0)
+    previous.runs[-1] = Run(head.name, head.start, tail.end)
+    return True
 
 
 def read_report(path):
@@ -188,6 +367,210 @@ def read_folder(path):
         raise NotADirectoryError('{} is not a folder'.format(path))
 
 
+def read_folder_ordered(path, stitch=False):
+    """Same as read_folder(), but reports are returned in date order.
+
+    Files are sorted by the date in their names before any of them is
+    opened and parsed. If stitch is True job runs that span midnight are
+    joined using stitch_runs(), in that case one report is read ahead.
+
+    Parameters
+    ----------
+    path : str
+        Path to the directory.
+    stitch : bool
+        Whether to join runs that span midnight.
+
+    Returns
+    -------
+    generator object
+        returns _read_folder_ordered(path, stitch)
+
+    Raises
+    ------
+    NotADirectoryError
+        Raised if given path is not existing directory.
+    """
+    if os.path.isdir(path):
+        return _read_folder_ordered(path, stitch)
+    else:
+        raise NotADirectoryError('{} is not a folder'.format(path))
+
+
+def _read_folder_ordered(path, stitch):
+    """Generator that returns Report objects in date order.
+
+    Parameters
+    ----------
+    path : str
+        Path to the directory.
+    stitch : bool
+        Whether to join runs that span midnight.
+
+    Yields
+    ------
+    Report
+        Report instance.
+    """
+    files = sorted((file for file in os.listdir(path)
+                    if file.endswith('.html')), key=date_from_filename)
+    reports = (Report(os.path.join(path, file)) for file in files)
+    if not stitch:
+        yield from reports
+        return
+    previous = next(reports, None)
+    for report in reports:
+        stitch_runs(previous, report)
+        yield previous
+        previous = report
+    if previous is not None:
+        yield previous
+
+
+def read_folders(paths, keep_duplicates=False):
+    """Read reports from several folders skipping duplicate files.
+
+    Parameters
+    ----------
+    paths : iterable
+        Paths to the directories.
+    keep_duplicates : bool
+        Whether to return copies of already parsed reports for duplicate
+        files. Copies share rows and summary with the first parsed report.
+
+    Returns
+    -------
+    DeduplicatedReports
+        Iterable over Report objects in date order.
+
+    Raises
+    ------
+    NotADirectoryError
+        Raised if any of given paths is not existing directory.
+    """
+    paths = list(paths)
+    for path in paths:
+        if not os.path.isdir(path):
+            raise NotADirectoryError('{} is not a folder'.format(path))
+    return DeduplicatedReports(paths, keep_duplicates)
+
+
+class DeduplicatedReports:
+    """Iterable over reports from several folders, parsing each unique
+    content only once.
+
+    Only files with the same date in their names can be duplicates, files
+    of different days are always parsed even if their content is the same.
+    Files are compared by date and size first and only files which size
+    matches size of another file of the same day are hashed, so discovery
+    doesn't read most files. Statistics below are filled in during
+    iteration.
+
+    Attributes
+    ----------
+    paths : list
+        Paths to the directories.
+    keep_duplicates : bool
+        Whether duplicate files are returned as copies of parsed reports.
+    skipped : int
+        Number of files that weren't parsed because of duplicate content.
+    duplicates : dict
+        Paths of skipped files mapped to paths of the parsed originals.
+    conflicts : dict
+        Dates mapped to sorted lists of paths that have the same date in
+        their names but different content.
+    """
+
+    def __init__(self, paths, keep_duplicates=False):
+        self.paths = paths
+        self.keep_duplicates = keep_duplicates
+        self.skipped = 0
+        self.duplicates = {}
+        self.conflicts = {}
+
+    def __iter__(self):
+        files = self.discover()
+        self.skipped = 0
+        self.duplicates = {}
+        # Content key -> path or Report of the first file. Keys include the
+        # date and files are sorted by it, so only one day is kept.
+        originals = {}
+        day = None
+        for path, key in files:
+            if key[0] != day:
+                originals.clear()
+                day = key[0]
+            if key not in originals:
+                report = Report(path)
+                originals[key] = report if self.keep_duplicates else path
+                yield report
+                continue
+            self.skipped += 1
+            if self.keep_duplicates:
+                self.duplicates[path] = originals[key].path
+                yield originals[key].shared_copy(path)
+            else:
+                self.duplicates[path] = originals[key]
+
+    def discover(self):
+        """Find report files and compute their content keys.
+
+        Also fills self.conflicts in.
+
+        Returns
+        -------
+        list
+            (path, content key) tuples sorted by date and path, content key
+            is (date, size, digest or None).
+        """
+        sizes = {}
+        for folder in self.paths:
+            for file in os.listdir(folder):
+                if file.endswith('.html'):
+                    path = os.path.join(folder, file)
+                    sizes[path] = (date_from_filename(path),
+                                   os.path.getsize(path))
+        counts = defaultdict(int)
+        for size in sizes.values():
+            counts[size] += 1
+        files = []
+        for path, (day, size) in sizes.items():
+            digest = _hash_file(path) if counts[(day, size)] > 1 else None
+            files.append((path, (day, size, digest)))
+        files.sort(key=lambda x: (x[1][0], x[0]))
+
+        by_date = defaultdict(dict)
+        for path, key in files:
+            by_date[key[0]].setdefault(key, path)
+        self.conflicts = {
+            day: sorted(keys.values()) for day, keys in by_date.items()
+            if len(keys) > 1
+        }
+        return files
+
+
+def _hash_file(path, chunk_size=65536):
+    """Returns sha1 hex digest of file's content.
+
+    Parameters
+    ----------
+    path : str
+        Path to the file.
+    chunk_size : int
+        Number of bytes read at once.
+
+    Returns
+    -------
+    str
+        Hex digest.
+    """
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 def _read_folder(path):
     """Generator that returns Report objects for html files in given folder.
 
@@ -206,7 +589,7 @@ def _read_folder(path):
         yield Report(os.path.join(path, file))
 
 
-def parse(path):
+def parse(path, job_names=None):
     """Extracts data wrapped in <tr> tags.
 
     Last 2 columns of report are not interesting and therefore omitted.
@@ -215,18 +598,25 @@ def parse(path):
     ----------
     path : str
         Path to the report file.
+    job_names : JobNames
+        If given, job names are interned in it and rows share its strings.
 
     Yields
     ------
     tuple
         Tuple of 3 useful report's rows : time, name, status.
     """
+    import lxml.html  # Imported here to keep `import cncparser` fast.
+
     tree = lxml.html.parse(path).getroot()
     iterator = tree.iter('tr')
     next(iterator)  # skip headers
     for elem in iterator:
         time, name, status, *_ = elem
-        yield convert_time(time.text), name.text, status.text
+        name = name.text
+        if job_names is not None:
+            name = job_names.canonical(name)
+        yield convert_time(time.text), name, status.text
 
 
 def convert_time(time):
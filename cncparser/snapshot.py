@@ -0,0 +1,375 @@
+"""Versioned binary snapshot of parsed reports.
+
+Snapshot keeps rows, job names and summaries of many reports in one file
+that can be memory-mapped, so reloading a corpus doesn't need re-parsing
+html or unpickling Report objects. Layout of the file:
+
+    header      '<8sHHIQQQQQ' magic, version, byte order mark, reserved,
+                names, reports, summary entries, events, size of strings
+
+Columns below use byte order of the machine that saved the snapshot:
+
+    int64       names offsets[names + 1], paths offsets[reports + 1],
+                dates[reports] (proleptic ordinals),
+                events start[reports + 1], summary start[reports + 1],
+                summary values[summary entries] (microseconds)
+    int32       summary job ids[summary entries], event seconds[events],
+                event job ids[events]
+    uint8       event statuses[events] (1 for STARTED, 0 for STOPPED),
+                utf-8 names and paths
+
+Job id 0 is 'idle', same as in cncparser.jobs.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import defaultdict
+from datetime import date, timedelta
+
+from .jobs import job_names as default_job_names
+from .report import Report
+
+MAGIC = b'CNCSNAP\x00'
+VERSION = 1
+BYTE_ORDER_MARK = 0x0102 if sys.byteorder == 'little' else 0x0201
+HEADER = struct.Struct('<8sHHIQQQQQ')
+MICROSECOND = timedelta(microseconds=1)
+STATUSES = ('STOPPED', 'STARTED')
+
+
+class SnapshotReport(Report):
+    """Report loaded from a snapshot.
+
+    Behaves like Report, rows and summary are decoded from the snapshot on
+    first access. Pickled reports are decoded and restored as Report.
+    """
+
+    def __init__(self, snapshot, index):
+        self._snapshot = snapshot
+        self._index = index
+        self.path = snapshot._paths[index]
+        self.job_names = snapshot.job_names
+        self.name_from_path()
+        self.date = date.fromordinal(snapshot._dates[index])
+
+    def __reduce__(self):
+        # Snapshot and its mapped file can't be pickled, so the report is
+        # decoded and sent as a plain Report.
+        state = {'path': self.path, 'name': self.name, 'date': self.date,
+                 'data': self.data, 'summary': self.summary}
+        if self.job_names is not default_job_names:
+            state['job_names'] = self.job_names
+        return _restore_report, (state,)
+
+    @property
+    def data(self):
+        """list : Rows decoded from the snapshot"""
+        try:
+            return self._data
+        except AttributeError:
+            self._data = self._snapshot._rows(self._index)
+            return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+
+    @property
+    def summary(self):
+        """defaultdict : Summary decoded from the snapshot"""
+        try:
+            return self._summary
+        except AttributeError:
+            self._summary = self._snapshot._summary(self._index)
+            return self._summary
+
+    @summary.setter
+    def summary(self, value):
+        self._summary = value
+        self.__dict__.pop('_summary_ids', None)
+
+    @property
+    def summary_ids(self):
+        """dict : Summary keyed by job ids
+
+        Decoded straight from the snapshot unless summary was already
+        decoded or replaced, e.g. by sum_data().
+        """
+        try:
+            return self._summary_ids
+        except AttributeError:
+            if '_summary' in self.__dict__:
+                return Report.summary_ids.fget(self)
+            self._summary_ids = self._snapshot._summary_by_id(self._index)
+            return self._summary_ids
+
+
+class Snapshot:
+    """Reports loaded from a snapshot file.
+
+    Use it as a context manager or call close() to release the file,
+    only reports decoded before that keep working, see close().
+
+    Attributes
+    ----------
+    path : str
+        Path to the snapshot file.
+    names : tuple
+        Job names stored in the snapshot.
+    reports : list
+        SnapshotReport objects in the order they were saved.
+    """
+
+    def __init__(self, path, use_mmap=True, job_names=None):
+        self.path = path
+        self.job_names = job_names or default_job_names
+        with open(path, 'rb') as f:
+            if use_mmap:
+                self._buffer = mmap.mmap(f.fileno(), 0,
+                                         access=mmap.ACCESS_READ)
+            else:
+                self._buffer = f.read()
+        self._views = []
+        self.closed = False
+        try:
+            self._load()
+        except BaseException:
+            self._release()
+            raise
+        self.reports = [SnapshotReport(self, i)
+                        for i in range(len(self._paths))]
+
+    def __len__(self):
+        return len(self.reports)
+
+    def __iter__(self):
+        return iter(self.reports)
+
+    def __getitem__(self, index):
+        return self.reports[index]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release the mapped file or the read content.
+
+        Rows and summaries that were already decoded stay with their
+        reports. Reading anything else from the reports afterwards raises
+        ValueError, so decode what is needed before closing, e.g. with
+        list(report.data for report in snapshot).
+        """
+        self._release()
+        self.closed = True
+
+    def _release(self):
+        """Release memory views and drop the buffer"""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._buffer = None
+
+    def _check_open(self):
+        """Raise ValueError if the snapshot was closed"""
+        if self.closed:
+            raise ValueError(
+                'Snapshot {} is closed, only reports decoded before close() '
+                'can be read'.format(self.path))
+
+    def _load(self):
+        """Read header, job names and reports table"""
+        if len(self._buffer) < HEADER.size:
+            raise ValueError('{} is not a snapshot file'.format(self.path))
+        (magic, version, bom, _, names, reports, entries, events,
+         strings) = HEADER.unpack_from(self._buffer)
+        if magic != MAGIC:
+            raise ValueError('{} is not a snapshot file'.format(self.path))
+        if version != VERSION:
+            raise ValueError(
+                'Unsupported snapshot version {}, expected {}'.format(
+                    version, VERSION))
+        if bom != BYTE_ORDER_MARK:
+            raise ValueError('Snapshot was saved with different byte order')
+        size = (HEADER.size + 8 * (names + 4 * reports + 4 + entries) +
+                4 * (entries + 2 * events) + events + strings)
+        if len(self._buffer) != size:
+            raise ValueError(
+                '{} is truncated or corrupt, expected {} bytes, got {}'.format(
+                    self.path, size, len(self._buffer)))
+
+        view = memoryview(self._buffer)
+        self._views.append(view)
+        offset = HEADER.size
+
+        def column(fmt, size, count):
+            nonlocal offset
+            part = view[offset:offset + size * count].cast(fmt)
+            self._views.append(part)
+            offset += size * count
+            return part
+
+        name_offsets = column('q', 8, names + 1)
+        path_offsets = column('q', 8, reports + 1)
+        self._dates = column('q', 8, reports)
+        self._event_start = column('q', 8, reports + 1)
+        self._summary_start = column('q', 8, reports + 1)
+        self._summary_values = column('q', 8, entries)
+        self._summary_job_ids = column('i', 4, entries)
+        self._seconds = column('i', 4, events)
+        self._jobs = column('i', 4, events)
+        self._statuses = column('B', 1, events)
+        text = bytes(view[offset:offset + strings]).decode('utf-8')
+
+        self.names = tuple(
+            self.job_names.canonical(text[name_offsets[i]:name_offsets[i + 1]])
+            for i in range(names)
+        )
+        self._job_ids = [self.job_names.intern(name) for name in self.names]
+        self._paths = [text[path_offsets[i]:path_offsets[i + 1]]
+                       for i in range(reports)]
+
+    def _rows(self, index):
+        """Returns rows of report with given index"""
+        self._check_open()
+        start, end = self._event_start[index], self._event_start[index + 1]
+        names = self.names
+        return [
+            (timedelta(seconds=s), names[j], STATUSES[st])
+            for s, j, st in zip(self._seconds[start:end],
+                                self._jobs[start:end],
+                                self._statuses[start:end])
+        ]
+
+    def _summary(self, index):
+        """Returns summary of report with given index"""
+        self._check_open()
+        start, end = self._summary_start[index], self._summary_start[index + 1]
+        data = defaultdict(timedelta)
+        names = self.names
+        for job_id, value in zip(self._summary_job_ids[start:end],
+                                 self._summary_values[start:end]):
+            data[names[job_id]] = value * MICROSECOND
+        return data
+
+    def _summary_by_id(self, index):
+        """Returns summary of report with given index keyed by job ids"""
+        self._check_open()
+        start, end = self._summary_start[index], self._summary_start[index + 1]
+        job_ids = self._job_ids
+        return {
+            job_ids[job_id]: value * MICROSECOND
+            for job_id, value in zip(self._summary_job_ids[start:end],
+                                     self._summary_values[start:end])
+        }
+
+
+def _restore_report(state):
+    """Returns Report with given state, used to unpickle SnapshotReport"""
+    report = Report.__new__(Report)
+    report.__setstate__(state)
+    return report
+
+
+def save_snapshot(reports, path):
+    """Save reports to a snapshot file.
+
+    File is written next to the destination and then moved in place, so
+    readers never see partially written snapshot.
+
+    Parameters
+    ----------
+    reports : iterable
+        Report objects to save.
+    path : str
+        Path to the snapshot file.
+
+    Returns
+    -------
+    int
+        Number of saved reports.
+    """
+    index = {'idle': 0}
+    names = ['idle']
+    paths = []
+    dates = array('q')
+    event_start, summary_start = array('q', [0]), array('q', [0])
+    summary_values, summary_ids = array('q'), array('i')
+    seconds, jobs, statuses = array('i'), array('i'), array('B')
+
+    def job_id(name):
+        try:
+            return index[name]
+        except KeyError:
+            index[name] = len(names)
+            names.append(name)
+            return index[name]
+
+    for report in reports:
+        paths.append(report.path)
+        dates.append(report.date.toordinal())
+        for time, name, status in report.data:
+            seconds.append(int(time.total_seconds()))
+            jobs.append(job_id(name))
+            statuses.append(status == 'STARTED')
+        for name, value in report.summary.items():
+            summary_ids.append(job_id(name))
+            summary_values.append(value // MICROSECOND)
+        event_start.append(len(seconds))
+        summary_start.append(len(summary_ids))
+
+    name_offsets, path_offsets = array('q', [0]), array('q', [0])
+    text = []
+    length = 0
+    for offsets, strings in ((name_offsets, names), (path_offsets, paths)):
+        offsets[0] = length
+        for string in strings:
+            text.append(string)
+            length += len(string)
+            offsets.append(length)
+    text = ''.join(text).encode('utf-8')
+
+    header = HEADER.pack(MAGIC, VERSION, BYTE_ORDER_MARK, 0, len(names),
+                         len(paths), len(summary_ids), len(seconds),
+                         len(text))
+    tmp_path = '{}.tmp{}'.format(path, os.getpid())
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        for column in (name_offsets, path_offsets, dates, event_start,
+                       summary_start, summary_values, summary_ids, seconds,
+                       jobs, statuses):
+            column.tofile(f)
+        f.write(text)
+    os.replace(tmp_path, path)
+    return len(paths)
+
+
+def load_snapshot(path, use_mmap=True, job_names=None):
+    """Load reports from a snapshot file.
+
+    Parameters
+    ----------
+    path : str
+        Path to the snapshot file.
+    use_mmap : bool
+        Whether to memory-map the file instead of reading it.
+    job_names : JobNames
+        Dictionary job names are interned in, shared one by default.
+
+    Returns
+    -------
+    Snapshot
+        Loaded reports.
+
+    Raises
+    ------
+    ValueError
+        Raised if file isn't a snapshot or its version is not supported.
+    """
+    return Snapshot(path, use_mmap, job_names)
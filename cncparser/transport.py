@@ -0,0 +1,293 @@
+"""Parallel parsing that returns results through shared memory.
+
+Worker processes parse reports and write compact columns into
+multiprocessing.shared_memory blocks instead of pickling Report objects
+back to the parent. Each block is laid out as:
+
+    summary  int64[jobs]     microseconds per job of Report.summary, index 0
+                             is 'idle'
+    seconds  int32[events]   time of the row since midnight
+    jobs     int32[events]   index of the row's job in SharedReport.names
+    status   uint8[events]   1 for STARTED, 0 for STOPPED
+
+Only small SharedReport descriptors are pickled.
+"""
+import os
+import weakref
+from array import array
+from collections import defaultdict
+from datetime import timedelta
+from multiprocessing import Pool, resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+from .report import Report, date_from_filename
+
+MICROSECOND = timedelta(microseconds=1)
+STATUSES = ('STOPPED', 'STARTED')
+
+
+class SharedReport:
+    """Descriptor of a report parsed into shared memory block.
+
+    Attributes
+    ----------
+    path : str
+        System path to a report file.
+    name : str
+        File name extracted from file path.
+    date : date
+        date obj, representing date report was generated.
+    block : str
+        Name of the shared memory block.
+    names : tuple
+        Job names, indexes of this tuple are stored in the block. Keys of
+        the report's summary go first, then names that only appear in rows.
+    jobs : int
+        Number of summary entries, the first names.
+    events : int
+        Number of parsed rows.
+    """
+
+    def __init__(self, path, block, names, jobs, events):
+        self.path = path
+        self.name = os.path.split(path)[1]
+        self.date = date_from_filename(path)
+        self.block = block
+        self.names = names
+        self.jobs = jobs
+        self.events = events
+
+    def _offsets(self):
+        """Returns offsets of summary, seconds, jobs and status columns"""
+        summary = 0
+        seconds = summary + 8 * self.jobs
+        jobs = seconds + 4 * self.events
+        status = jobs + 4 * self.events
+        return summary, seconds, jobs, status, status + self.events
+
+    @property
+    def summary(self):
+        """defaultdict : Summarized data read from the block"""
+        data = defaultdict(timedelta)
+        with _attached(self.block) as shm:
+            _add_summary(data, self, shm)
+        return data
+
+    def items(self):
+        """Simple addapter to dict .items() method"""
+        return self.summary.items()
+
+    def rows(self):
+        """Returns parsed rows decoded from the block.
+
+        Returns
+        -------
+        list
+            Tuples of time, name, status, same as Report.data.
+        """
+        summary, seconds, jobs, status, end = self._offsets()
+        with _attached(self.block) as shm:
+            buf = shm.buf
+            columns = (buf[seconds:jobs].cast('i'),
+                       buf[jobs:status].cast('i'),
+                       buf[status:end])
+            try:
+                return [
+                    (timedelta(seconds=s), self.names[j], STATUSES[st])
+                    for s, j, st in zip(*columns)
+                ]
+            finally:
+                for column in columns:
+                    column.release()
+
+
+class SharedResults:
+    """Reports parsed into shared memory blocks.
+
+    Blocks are owned by this object and are removed by close(), use it as
+    a context manager to do it automatically. Blocks of results that are
+    garbage collected or left at interpreter exit are removed as well.
+
+    Attributes
+    ----------
+    reports : list
+        SharedReport descriptors in the order of given paths.
+    """
+
+    def __init__(self, reports):
+        self.reports = reports
+        self._finalizer = weakref.finalize(
+            self, _unlink_blocks, [report.block for report in reports])
+
+    def __len__(self):
+        return len(self.reports)
+
+    def __iter__(self):
+        return iter(self.reports)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def aggregate(self):
+        """Returns summarized data of all reports, same as aggregate_data()
+
+        Only summary columns are read, rows aren't copied.
+        """
+        data = defaultdict(timedelta)
+        for report in self.reports:
+            with _attached(report.block) as shm:
+                _add_summary(data, report, shm)
+        return data
+
+    def close(self):
+        """Remove all shared memory blocks"""
+        self._finalizer()
+        self.reports = []
+
+
+def read_folder_shared(path, processes=None):
+    """Parse html files in given folder in several processes.
+
+    Parameters
+    ----------
+    path : str
+        Path to the directory.
+    processes : int
+        Number of worker processes, os.cpu_count() by default.
+
+    Returns
+    -------
+    SharedResults
+        Parsed reports, in date order.
+
+    Raises
+    ------
+    NotADirectoryError
+        Raised if given path is not existing directory.
+    """
+    if not os.path.isdir(path):
+        raise NotADirectoryError('{} is not a folder'.format(path))
+    files = sorted((file for file in os.listdir(path)
+                    if file.endswith('.html')), key=date_from_filename)
+    paths = [os.path.join(path, file) for file in files]
+    reports, error = [], None
+    with Pool(processes) as pool:
+        tasks = [pool.apply_async(_parse_into_shared, (path,))
+                 for path in paths]
+        try:
+            # Wait for every task, so blocks written by other workers are
+            # known and can be removed if any of them failed.
+            for task in tasks:
+                try:
+                    reports.append(task.get())
+                except Exception as exc:
+                    error = error or exc
+        except BaseException:
+            _unlink_blocks([report.block for report in reports])
+            raise
+    if error is not None:
+        _unlink_blocks([report.block for report in reports])
+        raise error
+    return SharedResults(reports)
+
+
+def _parse_into_shared(path):
+    """Parse report and write it into a new shared memory block.
+
+    The block isn't tracked by this process, so it survives the worker and
+    is removed by SharedResults.close() in the parent.
+
+    Parameters
+    ----------
+    path : str
+        Path to the report file.
+
+    Returns
+    -------
+    SharedReport
+        Descriptor of the written block.
+    """
+    report = Report(path)
+    index = {'idle': 0}
+    for name in report.summary:
+        index.setdefault(name, len(index))
+    summary_size = len(index)
+    for _, name, _ in report.data:
+        index.setdefault(name, len(index))
+    names = tuple(index)
+    shared = SharedReport(path, None, names, summary_size, len(report.data))
+    summary, seconds, jobs, status, end = shared._offsets()
+    summary_column = array('q', [0]) * summary_size
+    for name, value in report.summary.items():
+        summary_column[index[name]] = value // MICROSECOND
+    columns = (
+        summary_column,
+        array('i', [int(time.total_seconds()) for time, _, _ in report.data]),
+        array('i', [index[name] for _, name, _ in report.data]),
+        array('B', [state == 'STARTED' for _, _, state in report.data]),
+    )
+    shm = _create(max(end, 1))
+    shared.block = shm.name
+    try:
+        for start, column in zip((summary, seconds, jobs, status), columns):
+            raw = column.tobytes()
+            shm.buf[start:start + len(raw)] = raw
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    shm.close()
+    return shared
+
+
+def _unlink_blocks(blocks):
+    """Remove shared memory blocks with given names, if they still exist"""
+    for block in blocks:
+        try:
+            shm = SharedMemory(block)
+        except FileNotFoundError:
+            continue
+        shm.close()
+        shm.unlink()
+
+
+def _create(size):
+    """Create shared memory block that isn't tracked by this process"""
+    try:
+        return SharedMemory(create=True, size=size, track=False)
+    except TypeError:  # Python < 3.13 has no track argument.
+        shm = SharedMemory(create=True, size=size)
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm
+
+
+class _attached:
+    """Context manager that attaches to the shared memory block"""
+
+    def __init__(self, block):
+        self.block = block
+
+    def __enter__(self):
+        try:
+            self.shm = SharedMemory(self.block, track=False)
+        except TypeError:  # Python < 3.13 has no track argument.
+            self.shm = SharedMemory(self.block)
+            resource_tracker.unregister(self.shm._name, 'shared_memory')
+        return self.shm
+
+    def __exit__(self, *exc_info):
+        self.shm.close()
+
+
+def _add_summary(data, report, shm):
+    """Add summary column of the block to data"""
+    summary, seconds, *_ = report._offsets()
+    column = shm.buf[summary:seconds].cast('q')
+    try:
+        for name, value in zip(report.names, column):
+            data[name] += value * MICROSECOND
+    finally:
+        column.release()
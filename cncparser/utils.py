@@ -1,5 +1,6 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from collections import defaultdict
+from functools import lru_cache
 
 
 def convert_timedelta(item):
@@ -32,12 +33,12 @@ def _convert_date(date_string, s_format='%Y-%m-%d'):
     """Returns datetime object.
 
     Function used to convert string to datetime object.
-    If date_string is already a datetime object just returns it.
+    If date_string is already a datetime or date object just returns it.
 
     Parameters
     ----------
-    date_string : str or datetime
-        string or datetime object.
+    date_string : str, datetime or date
+        string, datetime or date object.
     s_format : str
         format of the date_string.
 
@@ -48,10 +49,15 @@ def _convert_date(date_string, s_format='%Y-%m-%d'):
     """
     if isinstance(date_string, str):
         return datetime.strptime(date_string, s_format)
-    elif isinstance(date_string, datetime):
+    elif isinstance(date_string, date):
         return date_string
     else:
-        raise TypeError(date_string, 'is not a string or datetime object')
+        raise TypeError(date_string, 'is not a string or date object')
+
+
+def _as_date(value):
+    """Returns date part of datetime object or value itself."""
+    return value.date() if isinstance(value, datetime) else value
 
 
 def filter_by_date(sequence, _min, _max):
@@ -72,8 +78,8 @@ def filter_by_date(sequence, _min, _max):
         Set with report objects in _max, _min date range.
         Empty if there is no reports in given range in sequence.
     """
-    _max, _min = [_convert_date(x) for x in (_max, _min)]
-    return {x for x in sequence if _max >= x.date >= _min}
+    _max, _min = [_as_date(_convert_date(x)) for x in (_max, _min)]
+    return {x for x in sequence if _max >= _as_date(x.date) >= _min}
 
 
 def get_by_date(sequence, date):
@@ -135,9 +141,12 @@ def aggregate_data(sequence):
     return data
 
 
+@lru_cache(maxsize=4096)
 def simplify_job_name(name):
     """Simplify job's path deleting it version tag and folder placement.
 
+    Results are memoised, a corpus has only a few thousand distinct jobs.
+
     Parameters
     ----------
     name : str
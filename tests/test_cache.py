@@ -0,0 +1,93 @@
+import unittest
+from unittest.mock import Mock, patch
+from datetime import date, timedelta
+
+from cncparser.cache import QueryCache
+from cncparser.utils import (aggregate_data, simplify_job_name,
+                             sort_descending)
+
+
+def make_report(day, summary):
+    report = Mock()
+    report.date = date(2017, 7, day)
+    report.items.return_value = summary.items()
+    return report
+
+
+class TestQueryCache(unittest.TestCase):
+
+    def setUp(self):
+        hour = timedelta(hours=1)
+        self.reports = [
+            make_report(1, {'a/prg1ver1.ISO': hour, 'idle': 23 * hour}),
+            make_report(2, {'b/prg1ver2.ISO': hour, 'idle': 23 * hour}),
+            make_report(3, {'a/prg2.ISO': 2 * hour, 'idle': 22 * hour}),
+        ]
+        self.cache = QueryCache(self.reports, maxsize=2)
+
+    def test_query_returns_aggregated_data(self):
+        result = self.cache.query('2017-07-01', '2017-07-02')
+        self.assertEqual(dict(result), {
+            'a/prg1ver1.ISO': timedelta(hours=1),
+            'b/prg1ver2.ISO': timedelta(hours=1),
+            'idle': timedelta(hours=46),
+        })
+
+    def test_query_applies_group_and_transform(self):
+        result = self.cache.query('2017-07-01', '2017-07-03',
+                                  group=simplify_job_name,
+                                  transform=sort_descending)
+        self.assertEqual(result[0], ('idle', timedelta(hours=68)))
+        self.assertCountEqual(result[1:], [('prg1.ISO', timedelta(hours=2)),
+                                           ('prg2.ISO', timedelta(hours=2))])
+
+    def test_repeated_query_is_answered_from_cache(self):
+        with patch('cncparser.cache.aggregate_data',
+                   wraps=aggregate_data) as mock:
+            first = self.cache.query('2017-07-01', '2017-07-03')
+            second = self.cache.query(date(2017, 7, 1), '2017-07-03')
+            self.assertIs(first, second)
+            self.assertEqual(mock.call_count, 1)
+        info = self.cache.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 1, 1))
+        self.assertEqual(self.cache.hit_rate, 0.5)
+
+    def test_least_recently_used_result_is_evicted(self):
+        self.cache.query('2017-07-01', '2017-07-01')
+        self.cache.query('2017-07-02', '2017-07-02')
+        self.cache.query('2017-07-01', '2017-07-01')  # Hit, now most recent.
+        self.cache.query('2017-07-03', '2017-07-03')  # Evicts 07-02.
+        self.cache.query('2017-07-01', '2017-07-01')
+        self.cache.query('2017-07-02', '2017-07-02')
+        self.assertEqual(self.cache.cache_info().hits, 2)
+        self.assertEqual(self.cache.cache_info().currsize, 2)
+
+    def test_maxsize_none_means_no_limit(self):
+        cache = QueryCache(self.reports, maxsize=None)
+        for day in range(1, 4):
+            cache.query('2017-07-01', '2017-07-0{}'.format(day))
+        self.assertEqual(cache.cache_info().currsize, 3)
+        self.assertIsNone(cache.cache_info().maxsize)
+
+    def test_maxsize_is_validated(self):
+        self.assertEqual(QueryCache(maxsize=-1).maxsize, 0)
+        with self.assertRaises(TypeError):
+            QueryCache(maxsize='10')
+
+    def test_adding_report_invalidates_results(self):
+        before = self.cache.query('2017-07-01', '2017-07-04')
+        self.cache.add(make_report(4, {'idle': timedelta(hours=24)}))
+        after = self.cache.query('2017-07-01', '2017-07-04')
+        self.assertEqual(after['idle'] - before['idle'], timedelta(hours=24))
+        self.assertEqual(self.cache.cache_info().hits, 0)
+
+    def test_replacing_report_invalidates_results(self):
+        self.cache.query('2017-07-01', '2017-07-01')
+        self.cache.add(make_report(1, {'idle': timedelta(hours=24)}))
+        result = self.cache.query('2017-07-01', '2017-07-01')
+        self.assertEqual(dict(result), {'idle': timedelta(hours=24)})
+        self.assertEqual(len(self.cache), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
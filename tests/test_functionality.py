@@ -1,6 +1,10 @@
+import gc
 import os
+import subprocess
+import sys
 import unittest
-from datetime import timedelta
+import weakref
+from datetime import date, timedelta
 from tempfile import TemporaryDirectory
 
 import cncparser
@@ -60,5 +64,126 @@ class SimpleFunctionalTestCase(unittest.TestCase):
             self.assertEqual(report.summary, fake_report.timings)
 
 
+class DeduplicationFunctionalTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.main = TemporaryDirectory(dir=BASE_DIR)
+        self.backup = TemporaryDirectory(dir=BASE_DIR)
+        normal, reverse = FakeReport(), FakeReport(reverse=True)
+        normal.generate_report()
+        reverse.generate_report()
+        files = [
+            (self.main.name, '2017_04_01.html', normal.html),
+            (self.main.name, '2017_04_02.html', reverse.html),
+            # Byte-identical backup copy.
+            (self.backup.name, '2017_04_01.html', normal.html),
+            # Re-export of the same size but with different content.
+            (self.backup.name, '2017_04_02.html',
+             reverse.html.replace('prg1', 'prg9')),
+        ]
+        self.paths = {}
+        for folder, name, html in files:
+            path = os.path.join(folder, name)
+            with open(path, 'w') as f:
+                f.write(html)
+            self.paths[(folder, name)] = path
+
+    def tearDown(self):
+        self.main.cleanup()
+        self.backup.cleanup()
+
+    def test_duplicate_files_are_parsed_once(self):
+        reports = cncparser.read_folders([self.main.name, self.backup.name])
+        parsed = list(reports)
+
+        self.assertEqual(len(parsed), 3)
+        self.assertEqual(reports.skipped, 1)
+        copies = [self.paths[(self.main.name, '2017_04_01.html')],
+                  self.paths[(self.backup.name, '2017_04_01.html')]]
+        ((duplicate, original),) = reports.duplicates.items()
+        self.assertCountEqual([duplicate, original], copies)
+        self.assertEqual(reports.conflicts, {
+            date(2017, 4, 2): sorted([
+                self.paths[(self.main.name, '2017_04_02.html')],
+                self.paths[(self.backup.name, '2017_04_02.html')],
+            ])
+        })
+
+    def test_duplicate_files_share_parsed_data(self):
+        reports = cncparser.read_folders([self.main.name, self.backup.name],
+                                         keep_duplicates=True)
+        parsed = list(reports)
+
+        self.assertEqual(len(parsed), 4)
+        self.assertEqual(reports.skipped, 1)
+        first, copy = [r for r in parsed if r.name == '2017_04_01.html']
+        self.assertIs(first.data, copy.data)
+        self.assertIs(first.summary, copy.summary)
+        self.assertNotEqual(first.path, copy.path)
+
+    def test_parsed_reports_of_previous_days_are_released(self):
+        reports = iter(cncparser.read_folders(
+            [self.main.name, self.backup.name], keep_duplicates=True))
+        first = weakref.ref(next(reports))
+        next(reports)  # Copy of the first report.
+        self.assertEqual(next(reports).name, '2017_04_02.html')
+        gc.collect()
+        self.assertIsNone(first())
+
+    def test_same_content_of_different_days_is_not_a_duplicate(self):
+        # E.g. two days when laser was idle all day long.
+        with open(self.paths[(self.main.name, '2017_04_01.html')]) as f:
+            html = f.read()
+        with open(os.path.join(self.main.name, '2017_04_03.html'), 'w') as f:
+            f.write(html)
+        reports = cncparser.read_folders([self.main.name, self.backup.name])
+        names = [r.name for r in reports]
+
+        self.assertEqual(names, ['2017_04_01.html', '2017_04_02.html',
+                                 '2017_04_02.html', '2017_04_03.html'])
+        self.assertEqual(reports.skipped, 1)
+        self.assertNotIn(os.path.join(self.main.name, '2017_04_03.html'),
+                         reports.duplicates)
+
+    def test_read_folders_raises_not_a_directory_error(self):
+        with self.assertRaises(NotADirectoryError):
+            cncparser.read_folders([self.main.name, 'not/a/folder'])
+
+
+class LazyImportTestCase(unittest.TestCase):
+
+    def lxml_loaded_after(self, statement):
+        code = statement + "\nimport sys; print('lxml' in sys.modules)"
+        output = subprocess.check_output([sys.executable, '-c', code],
+                                         cwd=os.path.dirname(BASE_DIR))
+        return output.decode().strip() == 'True'
+
+    def test_parser_dependencies_are_not_loaded_on_import(self):
+        self.assertFalse(self.lxml_loaded_after(
+            'import cncparser, cncparser.utils, cncparser.cache, '
+            'cncparser.jobs\nfrom cncparser import read_report'
+        ))
+
+    def test_parser_dependencies_are_loaded_on_parsing(self):
+        self.assertTrue(self.lxml_loaded_after(
+            'from io import StringIO\nfrom cncparser.report import parse\n'
+            "list(parse(StringIO('<table><tr><td>x</td></tr></table>')))"
+        ))
+
+    def test_package_attributes_are_resolved_lazily(self):
+        from cncparser.report import read_report
+        self.assertIs(cncparser.read_report, read_report)
+        self.assertIn('read_folders', dir(cncparser))
+        with self.assertRaises(AttributeError):
+            cncparser.read_everything
+
+    def test_submodules_are_available_after_package_import(self):
+        self.assertFalse(self.lxml_loaded_after(
+            'import cncparser\n'
+            'cncparser.report.Report, cncparser.utils.convert_timedelta\n'
+            'cncparser.jobs.JobNames, cncparser.cache.QueryCache'
+        ))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,114 @@
+import pickle
+import threading
+import unittest
+from unittest.mock import Mock, patch
+from datetime import timedelta
+
+from cncparser.jobs import IDLE, JobNames, aggregate_ids
+from cncparser.report import Report
+from tests.test_report import PARSED_DATA
+
+JOB = 'Metalware/Prefabricated/Housings/745.234.100ver20.05.ISO'
+
+
+class TestJobNames(unittest.TestCase):
+
+    def setUp(self):
+        self.names = JobNames()
+
+    def test_idle_id_is_reserved(self):
+        self.assertEqual(self.names.intern('idle'), IDLE)
+        self.assertEqual(len(self.names), 1)
+
+    def test_intern_assigns_same_id_to_same_name(self):
+        job_id = self.names.intern(JOB)
+        self.assertEqual(self.names.intern(''.join(JOB)), job_id)
+        self.assertEqual(self.names[job_id], JOB)
+        self.assertIn(JOB, self.names)
+
+    def test_canonical_returns_stored_string(self):
+        first = self.names.canonical(''.join(['a/', 'prg']))
+        second = self.names.canonical(''.join(['a/', 'prg']))
+        self.assertIs(first, second)
+
+    def test_simplified_and_folder_are_computed_once(self):
+        job_id = self.names.intern(JOB)
+        with patch('cncparser.jobs.simplify_job_name',
+                   return_value='745.234.100.ISO') as mock:
+            self.assertEqual(self.names.simplified(job_id), '745.234.100.ISO')
+            self.names.simplified(job_id)
+            self.assertEqual(mock.call_count, 1)
+        self.assertEqual(self.names.folder(job_id),
+                         ('Metalware', 'Prefabricated', 'Housings'))
+
+    def test_intern_is_thread_safe(self):
+        names = ['job{}'.format(i) for i in range(2000)]
+        threads = [threading.Thread(target=lambda: [self.names.intern(x)
+                                                    for x in names])
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.names), len(names) + 1)
+        ids = [self.names.intern(x) for x in names]
+        self.assertEqual(len(set(ids)), len(names))
+        for name, job_id in zip(names, ids):
+            self.assertEqual(self.names[job_id], name)
+
+    def test_job_names_can_be_pickled(self):
+        job_id = self.names.intern(JOB)
+        restored = pickle.loads(pickle.dumps(self.names))
+        self.assertEqual(restored[job_id], JOB)
+        self.assertEqual(restored.intern('other'), job_id + 1)
+
+    def test_resolve_merges_jobs_under_the_same_key(self):
+        hour = timedelta(hours=1)
+        data = {IDLE: hour,
+                self.names.intern('a/prg1ver1.ISO'): hour,
+                self.names.intern('b/prg1ver2.ISO'): hour}
+        self.assertEqual(dict(self.names.resolve(data, by='simplified')),
+                         {'idle': hour, 'prg1.ISO': 2 * hour})
+        self.assertEqual(dict(self.names.resolve(data, by='folder')),
+                         {'idle': hour, ('a',): hour, ('b',): hour})
+        with self.assertRaises(ValueError):
+            self.names.resolve(data, by='size')
+
+
+class TestReportsWithJobNames(unittest.TestCase):
+
+    def setUp(self):
+        self.names = JobNames()
+        with patch('cncparser.report.parse', return_value=PARSED_DATA):
+            self.reports = [
+                Report('2017_07_04.html', job_names=self.names),
+                Report('2017_07_05.html', job_names=self.names),
+            ]
+
+    def test_summary_ids_uses_ids_from_job_names(self):
+        summary_ids = self.reports[0].summary_ids
+        self.assertEqual(summary_ids[IDLE], timedelta(seconds=79200))
+        job_id = self.names.intern('sub/sub/sub/Pr1.ISO')
+        self.assertEqual(summary_ids[job_id], timedelta(hours=1))
+
+    def test_summary_ids_is_computed_once(self):
+        report = self.reports[0]
+        with patch.object(self.names, 'intern', wraps=self.names.intern) as m:
+            self.assertIs(report.summary_ids, report.summary_ids)
+            self.assertEqual(m.call_count, len(report.summary))
+
+    def test_aggregate_ids_summarizes_reports(self):
+        data = aggregate_ids(self.reports)
+        self.assertEqual(dict(self.names.resolve(data, by='simplified')),
+                         {'idle': timedelta(seconds=158400),
+                          'Pr1.ISO': timedelta(hours=2),
+                          'Pr2.ISO': timedelta(hours=2)})
+
+    def test_aggregate_ids_works_with_any_objects_with_summary_ids(self):
+        report = Mock(summary_ids={IDLE: timedelta(hours=24)})
+        self.assertEqual(dict(aggregate_ids([report, report])),
+                         {IDLE: timedelta(hours=48)})
+
+
+if __name__ == '__main__':
+    unittest.main()
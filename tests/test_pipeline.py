@@ -0,0 +1,106 @@
+import os
+import unittest
+from datetime import date, timedelta
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import cncparser
+from cncparser.pipeline import (Record, group, map_summary, project, reduce,
+                                run, scan, select_dates)
+from cncparser.report import Report
+from cncparser.utils import _update_default_dict, aggregate_data
+from tests.fakereport import FakeReport
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory(dir=BASE_DIR)
+        for day in (1, 2, 3, 30):
+            report = FakeReport(reverse=not day % 2)
+            report.generate_report()
+            name = '2017_04_{:02}.html'.format(day)
+            with open(os.path.join(self.tmp_dir.name, name), 'w') as f:
+                f.write(report.html)
+        self.reports = list(cncparser.read_folder_ordered(self.tmp_dir.name))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_scan_returns_records_in_date_order_without_parsing(self):
+        with patch('cncparser.pipeline.Report') as report_mock:
+            records = list(scan(self.tmp_dir.name))
+            self.assertEqual(report_mock.call_count, 0)
+        self.assertEqual([r.date.day for r in records], [1, 2, 3, 30])
+        self.assertEqual(records[0].name, '2017_04_01.html')
+
+    def test_select_dates_skips_files_without_parsing_them(self):
+        with patch('cncparser.pipeline.Report', wraps=Report) as report_mock:
+            items = list(run(scan(self.tmp_dir.name),
+                             select_dates('2017-04-02', date(2017, 4, 3)),
+                             project(fields=['date', 'idle'])))
+            self.assertEqual(report_mock.call_count, 2)
+        self.assertEqual(items, [
+            {'date': r.date, 'idle': r.idle_time} for r in self.reports[1:3]
+        ])
+
+    def test_project_releases_parsed_report(self):
+        records = list(scan(self.tmp_dir.name))
+        items = list(project(fields=['busy_time', 'jobs'])(records))
+        for record, item, report in zip(records, items, self.reports):
+            self.assertIsNone(record._report)
+            self.assertEqual(item, {'busy_time': report.busy_time,
+                                    'jobs': report.jobs})
+
+    def test_project_raises_value_error_for_unknown_fields(self):
+        with self.assertRaises(ValueError):
+            project(fields=['idle', 'size'])
+
+    def test_map_summary_changes_summary_based_fields(self):
+        items = run(scan(self.tmp_dir.name),
+                    map_summary(lambda s: {'idle': s['idle'], 'all': 1}),
+                    project(fields=['idle', 'jobs']))
+        for item, report in zip(items, self.reports):
+            self.assertEqual(item, {'idle': report.idle_time,
+                                    'jobs': {'all': 1}})
+
+    def test_group_and_reduce_fold_items_per_group(self):
+        result = run(scan(self.tmp_dir.name),
+                     project(fields=['date', 'idle']),
+                     group(lambda item: item['date'].day < 15),
+                     reduce(lambda total, item: total + item['idle'],
+                            timedelta()))
+        expected = {
+            True: sum((r.idle_time for r in self.reports[:3]), timedelta()),
+            False: self.reports[3].idle_time,
+        }
+        self.assertEqual(result, expected)
+
+    def test_reduce_without_group_returns_single_value(self):
+        def merge(total, record):
+            _update_default_dict(total, record.summary)
+            return total
+
+        result = run(scan(self.tmp_dir.name),
+                     reduce(merge, aggregate_data([])))
+        self.assertEqual(result, aggregate_data(self.reports))
+
+    def test_reduce_without_initial_starts_from_first_item(self):
+        result = run(iter([1, 2, 3]), reduce(lambda a, b: a + b))
+        self.assertEqual(result, 6)
+
+    def test_record_fields_match_report(self):
+        record = Record(self.reports[0].path)
+        self.assertEqual(record.data, self.reports[0].data)
+        self.assertEqual(record.runs, self.reports[0].runs)
+        self.assertEqual(record.summary, self.reports[0].summary)
+
+    def test_scan_raises_not_a_directory_error(self):
+        with self.assertRaises(NotADirectoryError):
+            scan(self.tmp_dir.name, os.path.join(self.tmp_dir.name, 'x'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,12 @@
 import unittest
-from datetime import date, timedelta
+from collections import defaultdict
+from datetime import date, datetime, timedelta
 from io import StringIO
 from unittest.mock import patch, call
 
-from cncparser.report import (Report, convert_time, parse, read_folder,
-                              read_report)
+from cncparser.report import (Report, Run, convert_time, date_from_filename,
+                              parse, read_folder, read_folder_ordered,
+                              read_report, stitch_runs)
 
 SAMPLE = StringIO("""
 <TABLE>
@@ -49,6 +51,20 @@ PARSED_DATA = [
 ]
 
 
+# Job started at the end of the day and stopped on the next day.
+EVENING_DATA = [
+    (timedelta(hours=1), 'Pr1.ISO', 'STARTED'),
+    (timedelta(hours=2), 'Pr1.ISO', 'STOPPED'),
+    (timedelta(hours=23), 'Pr2.ISO', 'STARTED')
+]
+
+MORNING_DATA = [
+    (timedelta(hours=1), 'Pr2.ISO', 'STOPPED'),
+    (timedelta(hours=3), 'Pr1.ISO', 'STARTED'),
+    (timedelta(hours=4), 'Pr1.ISO', 'STOPPED')
+]
+
+
 SUMMARY = {'sub/sub/sub/Pr1.ISO': timedelta(seconds=3600),
            'sub/sub/sub/Pr2.ISO': timedelta(seconds=3600),
            'idle': timedelta(seconds=79200)}
@@ -94,6 +110,32 @@ class TestParsingRealtedFunctions(unittest.TestCase):
             ]
             self.assertEqual(calls, report_mock.call_args_list)
 
+    @patch('cncparser.report.os.path.isdir', return_value=True)
+    @patch('cncparser.report.os.listdir',
+           return_value=['2017_07_10.html', '2016_12_31.html',
+                         '2017_07_09.html', 'somefile.iso'])
+    def test_read_folder_ordered_returns_reports_in_date_order(self, listdir_m,
+                                                               isdir_m):
+        path = 'C:/CNC/jobs/reports'
+        with patch('cncparser.report.Report') as report_mock:
+            list(read_folder_ordered(path))  # Consume generator.
+            calls = [
+                (call('C:/CNC/jobs/reports/2016_12_31.html')),
+                (call('C:/CNC/jobs/reports/2017_07_09.html')),
+                (call('C:/CNC/jobs/reports/2017_07_10.html'))
+            ]
+            self.assertEqual(calls, report_mock.call_args_list)
+
+    def test_read_folder_ordered_raises_not_a_directory_error(self):
+        with self.assertRaises(NotADirectoryError):
+            read_folder_ordered('C:/CNC/jobs/reports')
+
+    def test_date_from_filename_accepts_names_and_paths(self):
+        self.assertEqual(date_from_filename('2017_07_04.html'),
+                         date(2017, 7, 4))
+        self.assertEqual(date_from_filename('C:/reports/2017_07_04.html'),
+                         date(2017, 7, 4))
+
     def test_read_folder_raises_not_a_directory_error(self):
         path = 'C:/CNC/jobs/reports'
         msg = '{} is not a folder'.format(path)
@@ -143,6 +185,84 @@ class TestReportObjectBehaving(unittest.TestCase):
     def test_sum_data_returns_summarized_data(self):
         self.assertEqual(dict(self.report.summary), SUMMARY)
 
+    def test_runs_are_computed_on_first_access(self):
+        self.assertNotIn('_runs', self.report.__dict__)
+        self.assertIs(self.report.runs, self.report.runs)
+
+    def test_split_runs_returns_job_runs(self):
+        start = datetime(2017, 7, 4)
+        self.assertEqual(self.report.runs, [
+            Run('sub/sub/sub/Pr1.ISO', start, start + timedelta(hours=1)),
+            Run('sub/sub/sub/Pr2.ISO', start + timedelta(seconds=3900),
+                start + timedelta(seconds=7500))
+        ])
+        self.assertEqual(self.report.runs[0].duration, timedelta(hours=1))
+
+
+class TestRunsStitching(unittest.TestCase):
+
+    def make_report(self, path, data):
+        with patch('cncparser.report.parse', return_value=data):
+            return Report(path)
+
+    def setUp(self):
+        self.evening = self.make_report('2017_07_04.html', EVENING_DATA)
+        self.morning = self.make_report('2017_07_05.html', MORNING_DATA)
+
+    def test_run_durations_match_summary(self):
+        data = [
+            (timedelta(hours=1), 'A', 'STARTED'),
+            (timedelta(hours=2), 'A', 'STOPPED'),
+            (timedelta(hours=3), 'B', 'STOPPED'),
+            (timedelta(hours=4), 'C', 'STARTED'),
+            (timedelta(hours=5), 'D', 'STARTED'),
+            (timedelta(hours=6), 'D', 'STOPPED'),
+            (timedelta(hours=23), 'E', 'STARTED'),
+        ]
+        for report in (self.make_report('2017_07_06.html', data),
+                       self.evening, self.morning):
+            durations = defaultdict(timedelta)
+            for run in report.runs:
+                durations[run.name] += run.duration
+            self.assertEqual(durations, report.jobs)
+        report = self.make_report('2017_07_06.html', data)
+        self.assertEqual(report.runs[1], Run('B', datetime(2017, 7, 6, 2),
+                                             datetime(2017, 7, 6, 3)))
+
+    def test_split_runs_keeps_runs_that_span_midnight_open(self):
+        self.assertEqual(self.evening.runs[-1].end, datetime(2017, 7, 5))
+        self.assertEqual(self.morning.runs[0].start, datetime(2017, 7, 5))
+
+    def test_stitch_runs_joins_run_that_spans_midnight(self):
+        self.assertTrue(stitch_runs(self.evening, self.morning))
+        self.assertEqual(self.evening.runs[-1],
+                         Run('Pr2.ISO', datetime(2017, 7, 4, 23),
+                             datetime(2017, 7, 5, 1)))
+        self.assertEqual(self.evening.runs[-1].duration, timedelta(hours=2))
+        self.assertEqual(len(self.morning.runs), 1)
+        # Summaries still account only the time of their own day.
+        self.assertEqual(self.evening.summary['Pr2.ISO'], timedelta(hours=1))
+        self.assertEqual(self.morning.summary['Pr2.ISO'], timedelta(hours=1))
+
+    def test_stitch_runs_ignores_reports_that_are_not_adjacent(self):
+        later = self.make_report('2017_07_06.html', MORNING_DATA)
+        self.assertFalse(stitch_runs(self.evening, later))
+        self.assertEqual(len(later.runs), 2)
+
+    @patch('cncparser.report.os.path.isdir', return_value=True)
+    @patch('cncparser.report.os.listdir',
+           return_value=['2017_07_05.html', '2017_07_04.html'])
+    def test_read_folder_ordered_stitches_runs(self, listdir_m, isdir_m):
+        data = {'2017_07_04.html': EVENING_DATA,
+                '2017_07_05.html': MORNING_DATA}
+        with patch('cncparser.report.parse',
+                   side_effect=lambda path, names: data[path.split('/')[-1]]):
+            reports = list(read_folder_ordered('reports', stitch=True))
+        self.assertEqual([r.name for r in reports],
+                         ['2017_07_04.html', '2017_07_05.html'])
+        self.assertEqual(reports[0].runs[-1].duration, timedelta(hours=2))
+        self.assertEqual(len(reports[1].runs), 1)
+
 
 if __name__ == '__main__':
     unittest.main()
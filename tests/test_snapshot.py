@@ -0,0 +1,132 @@
+import os
+import pickle
+import unittest
+from tempfile import TemporaryDirectory
+
+import cncparser
+from cncparser.jobs import JobNames
+from cncparser.report import Report
+from cncparser.snapshot import load_snapshot, save_snapshot, HEADER
+from cncparser.utils import aggregate_data
+from tests.fakereport import FakeReport
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory(dir=BASE_DIR)
+        for i in range(1, 5):
+            report = FakeReport(reverse=not i % 2)
+            report.generate_report()
+            name = '2017_04_0{}.html'.format(i)
+            with open(os.path.join(self.tmp_dir.name, name), 'w') as f:
+                f.write(report.html)
+        self.reports = list(cncparser.read_folder_ordered(self.tmp_dir.name))
+        self.path = os.path.join(self.tmp_dir.name, 'corpus.snap')
+        save_snapshot(self.reports, self.path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def assertSameReports(self, loaded):
+        self.assertEqual(len(loaded), len(self.reports))
+        for report, restored in zip(self.reports, loaded):
+            self.assertIsInstance(restored, Report)
+            self.assertEqual(restored.path, report.path)
+            self.assertEqual(restored.name, report.name)
+            self.assertEqual(restored.date, report.date)
+            self.assertEqual(restored.data, report.data)
+            self.assertEqual(restored.summary, report.summary)
+            self.assertEqual(restored.runs, report.runs)
+            self.assertEqual(restored.idle_time, report.idle_time)
+            self.assertEqual(restored.busy_time, report.busy_time)
+
+    def test_loaded_reports_behave_like_parsed_reports(self):
+        with load_snapshot(self.path) as snapshot:
+            self.assertSameReports(snapshot)
+            for report, restored in zip(self.reports, snapshot):
+                self.assertEqual(restored.summary_ids, report.summary_ids)
+            self.assertEqual(aggregate_data(snapshot),
+                             aggregate_data(self.reports))
+
+    def test_snapshot_can_be_read_without_mmap(self):
+        with load_snapshot(self.path, use_mmap=False) as snapshot:
+            self.assertSameReports(snapshot)
+
+    def test_decoded_reports_can_be_used_after_close(self):
+        for use_mmap in (True, False):
+            with load_snapshot(self.path, use_mmap=use_mmap) as snapshot:
+                loaded = list(snapshot)
+                for report in loaded:
+                    report.data, report.summary
+            self.assertSameReports(loaded)
+            snapshot.close()  # Closing twice is fine.
+
+    def test_reading_undecoded_report_after_close_raises_value_error(self):
+        for use_mmap in (True, False):
+            with load_snapshot(self.path, use_mmap=use_mmap) as snapshot:
+                report = snapshot[0]
+            self.assertTrue(snapshot.closed)
+            with self.assertRaises(ValueError):
+                report.idle_time
+            with self.assertRaises(ValueError):
+                report.data
+
+    def test_sum_data_works_on_loaded_reports(self):
+        with load_snapshot(self.path) as snapshot:
+            for report, restored in zip(self.reports, snapshot):
+                restored.sum_data()
+                self.assertEqual(restored.summary, report.summary)
+                self.assertEqual(restored.summary_ids, report.summary_ids)
+
+    def test_loaded_reports_can_be_pickled(self):
+        with load_snapshot(self.path) as snapshot:
+            restored = pickle.loads(pickle.dumps(list(snapshot)))
+        for report in restored:
+            self.assertIs(type(report), Report)
+        self.assertSameReports(restored)
+
+    def test_job_names_are_interned_on_load(self):
+        names = JobNames()
+        with load_snapshot(self.path, job_names=names) as snapshot:
+            self.assertEqual(snapshot.names[0], 'idle')
+            for name in snapshot.names:
+                self.assertIn(name, names)
+            self.assertEqual(snapshot[0].summary_ids[0],
+                             self.reports[0].idle_time)
+
+    def test_empty_snapshot(self):
+        path = os.path.join(self.tmp_dir.name, 'empty.snap')
+        self.assertEqual(save_snapshot([], path), 0)
+        with load_snapshot(path) as snapshot:
+            self.assertEqual(len(snapshot), 0)
+
+    def test_load_snapshot_rejects_other_files(self):
+        path = os.path.join(self.tmp_dir.name, '2017_04_01.html')
+        with self.assertRaises(ValueError):
+            load_snapshot(path)
+
+    def test_load_snapshot_rejects_truncated_files(self):
+        size = os.path.getsize(self.path)
+        for cut in (1, 3, 8, size - HEADER.size):
+            with open(self.path, 'rb') as f:
+                content = f.read()
+            path = os.path.join(self.tmp_dir.name, 'cut.snap')
+            with open(path, 'wb') as f:
+                f.write(content[:-cut])
+            with self.assertRaises(ValueError):
+                load_snapshot(path)
+
+    def test_load_snapshot_rejects_unknown_version(self):
+        with open(self.path, 'r+b') as f:
+            f.seek(8)
+            f.write(b'\xff\xff')
+        with self.assertRaises(ValueError):
+            load_snapshot(self.path)
+        self.assertGreater(os.path.getsize(self.path), HEADER.size)
+
+
+if __name__ == '__main__':
+    unittest.main()
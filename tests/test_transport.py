@@ -0,0 +1,120 @@
+import os
+import pickle
+import unittest
+from multiprocessing.shared_memory import SharedMemory
+from tempfile import TemporaryDirectory
+
+import cncparser
+from cncparser.jobs import JobNames
+from cncparser.report import Report
+from cncparser.transport import read_folder_shared
+from cncparser.utils import aggregate_data
+from tests.fakereport import FakeReport
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestSharedMemoryTransport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory(dir=BASE_DIR)
+        for i in range(1, 5):
+            report = FakeReport(reverse=not i % 2)
+            report.generate_report()
+            name = '2017_04_0{}.html'.format(i)
+            with open(os.path.join(self.tmp_dir.name, name), 'w') as f:
+                f.write(report.html)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, name, html):
+        with open(os.path.join(self.tmp_dir.name, name), 'w') as f:
+            f.write(html)
+
+    def test_aggregate_matches_aggregate_data(self):
+        # Job started twice in a row never gets into the summary.
+        self.write('2017_04_05.html', '''<table>
+            <tr><th>time</th><th>name</th><th>status</th></tr>
+            <tr><td>01:00:00</td><td>prg1</td><td>STARTED</td></tr>
+            <tr><td>02:00:00</td><td>prg2</td><td>STARTED</td></tr>
+            <tr><td>03:00:00</td><td>prg2</td><td>STOPPED</td></tr>
+            </table>''')
+        expected = aggregate_data(cncparser.read_folder(self.tmp_dir.name))
+        with read_folder_shared(self.tmp_dir.name, processes=2) as results:
+            self.assertEqual(len(results), 5)
+            self.assertNotIn('prg1', results.reports[-1].summary)
+            self.assertEqual(results.aggregate(), expected)
+
+    def test_shared_reports_behave_like_parsed_reports(self):
+        with read_folder_shared(self.tmp_dir.name, processes=2) as results:
+            names = [r.name for r in results]
+            self.assertEqual(names, sorted(names))
+            for shared in results:
+                report = cncparser.read_report(shared.path)
+                self.assertEqual(shared.date, report.date)
+                self.assertEqual(shared.rows(), report.data)
+                self.assertEqual(shared.summary, report.summary)
+
+    def test_close_removes_shared_memory_blocks(self):
+        results = read_folder_shared(self.tmp_dir.name, processes=2)
+        blocks = [r.block for r in results]
+        results.close()
+        for block in blocks:
+            with self.assertRaises(FileNotFoundError):
+                SharedMemory(block)
+
+    @unittest.skipUnless(os.path.isdir('/dev/shm'), 'needs /dev/shm')
+    def test_blocks_are_removed_if_any_worker_fails(self):
+        self.write('2017_04_05.html', '<table><tr><th>x</th></tr>'
+                                      '<tr><td>bad</td></tr></table>')
+        before = set(os.listdir('/dev/shm'))
+        with self.assertRaises(ValueError):
+            read_folder_shared(self.tmp_dir.name, processes=2)
+        self.assertEqual(set(os.listdir('/dev/shm')) - before, set())
+
+    @unittest.skipUnless(os.path.isdir('/dev/shm'), 'needs /dev/shm')
+    def test_blocks_are_removed_when_results_are_collected(self):
+        before = set(os.listdir('/dev/shm'))
+        results = read_folder_shared(self.tmp_dir.name, processes=2)
+        self.assertEqual(len(set(os.listdir('/dev/shm')) - before), 4)
+        del results
+        self.assertEqual(set(os.listdir('/dev/shm')) - before, set())
+
+    def test_read_folder_shared_raises_not_a_directory_error(self):
+        with self.assertRaises(NotADirectoryError):
+            read_folder_shared(os.path.join(self.tmp_dir.name, 'missing'))
+
+    def test_pickled_report_does_not_carry_job_names(self):
+        path = os.path.join(self.tmp_dir.name, '2017_04_01.html')
+        report = cncparser.read_report(path)
+        report.summary_ids  # Cached ids are dropped along with names.
+        state = report.__getstate__()
+        self.assertNotIn('job_names', state)
+        self.assertNotIn('_summary_ids', state)
+        restored = pickle.loads(pickle.dumps(report))
+        self.assertIs(restored.job_names, report.job_names)
+        self.assertEqual(restored.summary_ids, report.summary_ids)
+
+    def test_pickled_report_keeps_custom_job_names(self):
+        names = JobNames()
+        names.intern('unrelated')
+        path = os.path.join(self.tmp_dir.name, '2017_04_01.html')
+        report = Report(path, job_names=names)
+        restored = pickle.loads(pickle.dumps(report))
+        self.assertIsNot(restored.job_names, report.job_names)
+        self.assertEqual(restored.summary_ids, report.summary_ids)
+        self.assertEqual(
+            restored.job_names.resolve(restored.summary_ids),
+            report.summary)
+
+    def test_report_without_job_names_can_be_pickled(self):
+        path = os.path.join(self.tmp_dir.name, '2017_04_01.html')
+        report = cncparser.read_report(path)
+        del report.job_names
+        restored = pickle.loads(pickle.dumps(report))
+        self.assertEqual(restored.summary, report.summary)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 from unittest.mock import Mock, patch
-from datetime import timedelta, datetime
+from datetime import date, timedelta, datetime
 from collections import defaultdict
 
 from cncparser.utils import (_convert_date, convert_timedelta,
@@ -41,6 +41,7 @@ class TestGeneralPurposeUtilityFunctions(unittest.TestCase):
         job_name = 'Metalware/Prefabricated/Housings/745.234.100ver20.05.ISO'
         simplified_name = simplify_job_name(job_name)
         self.assertEqual(simplified_name, '745.234.100.ISO')
+        self.assertGreater(simplify_job_name.cache_info().currsize, 0)
 
     def test_sort_descending_returns_list_of_tuples_in_descending_order(self):
         d = {'prg1': 8, 'prg2': 1, 'prg3': 12, 'prg4': 4}
@@ -68,6 +69,13 @@ class TestUtilityFunctionsThatWorksWithReportObjects(unittest.TestCase):
         self.assertCountEqual([x.date for x in filtered],
                               [datetime(2017, 7, x) for x in range(3, 6)])
 
+    def test_filter_by_date_works_with_date_objects(self):
+        for report in self.reports:
+            report.date = report.date.date()
+        filtered = filter_by_date(self.reports, '2017-07-04', date(2017, 7, 5))
+        self.assertCountEqual([x.date for x in filtered],
+                              [date(2017, 7, 4), date(2017, 7, 5)])
+
     def test_get_by_date_returns_report_with_desired_date(self):
         desired_date = '2017-07-04'
         report = get_by_date(self.reports, desired_date)